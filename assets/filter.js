@@ -0,0 +1,15 @@
+// Clientside category filter for the dashboard (see StartupDashboard.setup_callbacks).
+// Swaps in the precomputed figures for the selected category and filters the
+// table rows in the browser, so dropdown changes never reach the server.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    filter: {
+        apply: function(selectedCategory, figures, rows) {
+            // Unknown values (e.g. a cleared dropdown) fall back to all categories
+            const category = figures[selectedCategory] ? selectedCategory : "all";
+            const tableRows = category === "all"
+                ? rows
+                : rows.filter(function(row) { return row.category === category; });
+            return figures[category].concat([tableRows]);
+        }
+    }
+});
@@ -1,10 +1,54 @@
 """Module for categorizing startups using Claude API."""
 
+import asyncio
+import hashlib
+import os
+import shelve
+import textwrap
 import anthropic
+import numpy as np
+import orjson
 import pandas as pd
 from typing import List, Dict
 import json
 import config
+from semantic_cache import SemanticCategoryCache
+
+
+# Static categorization guidance. Sent as a cached system block so repeat
+# requests only pay full input-token cost for the startup JSON.
+STATIC_INSTRUCTIONS = """You are an expert at analyzing and categorizing startups by their business themes and focus areas.
+
+You will be given a JSON array of startups. Each object has "i" (the startup's numeric id), "n" (its name) and "d" (its description). Please categorize each startup into appropriate themes using natural language understanding.
+
+For each startup, provide:
+1. A primary category (e.g., "AI Infrastructure", "Digital Health", "Developer Tools", "Fintech", "Enterprise Software", etc.)
+2. A subcategory (more specific classification)
+3. A list of relevant themes/tags
+
+Please respond with a JSON array where each object contains:
+- id: the startup's numeric id ("i" in the input)
+- category: the primary category
+- subcategory: a more specific subcategory
+- themes: an array of relevant theme tags
+
+Focus on creating meaningful, consistent categories that help group similar companies together. Consider aspects like:
+- Technology focus (AI/ML, blockchain, cloud, etc.)
+- Industry vertical (healthcare, finance, education, etc.)
+- Target customer (B2B, B2C, developer tools, enterprise, etc.)
+- Problem space (productivity, infrastructure, security, etc.)
+
+Return ONLY the JSON array, no additional text."""
+
+
+def _label_version(model: str) -> str:
+    """Fingerprint the model and instructions that cached categories came from."""
+    return hashlib.blake2b(f"{model}|{STATIC_INSTRUCTIONS}".encode(), digest_size=8).hexdigest()
+
+
+def _cache_key(name: str, description: str, version: str) -> str:
+    """Hash a startup's name and description into a category cache key."""
+    return hashlib.blake2b(f"{version}|{name}|{description}".encode(), digest_size=16).hexdigest()
 
 
 class StartupCategorizer:
@@ -16,99 +60,298 @@ class StartupCategorizer:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found. Please set it in .env file.")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            # _call_claude owns retries; SDK retries would multiply the attempts
+            max_retries=0,
+            default_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
+        )
         self.model = config.CLAUDE_MODEL
-
-    def categorize_startups(self, startups_df: pd.DataFrame) -> pd.DataFrame:
+        # Changing the model or the prompt invalidates every cached category
+        self.label_version = _label_version(self.model)
+        os.makedirs(os.path.dirname(config.CATEGORY_CACHE_PATH), exist_ok=True)
+
+        self.semantic_cache = None
+        if config.SEMANTIC_CACHE_ENABLED:
+            try:
+                self.semantic_cache = SemanticCategoryCache(version=self.label_version)
+            except ImportError:
+                print("✗ sentence-transformers is not installed. Semantic cache disabled.")
+
+    def categorize_startups(self, startups_df: pd.DataFrame, use_cache: bool = True) -> pd.DataFrame:
         """
         Categorize startups using Claude's natural language understanding.
 
+        Startups with an unchanged name and description are served from the
+        persistent category cache. Large runs (more than
+        config.BATCH_API_THRESHOLD uncached startups) are sent through the
+        Message Batches API.
+
         Args:
             startups_df: DataFrame with startup information
+            use_cache: Whether to reuse cached categories; False asks Claude
+                about every startup and refreshes the cache
 
         Returns:
             DataFrame with added 'category' and 'subcategory' columns
         """
-        # Prepare the startup data for Claude
-        startups_list = []
-        for idx, row in startups_df.iterrows():
-            startups_list.append({
-                "id": idx,
-                "name": row["name"],
-                "description": row["description"]
-            })
-
-        # Create the prompt for Claude
-        prompt = self._create_categorization_prompt(startups_list)
-
-        print("Sending categorization request to Claude...")
-
-        # Call Claude API
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+        return self._categorize(startups_df, force_batch=False, use_cache=use_cache)
 
-        # Parse the response
-        response_text = message.content[0].text
-        print("Received categorization response from Claude")
-
-        # Extract JSON from response
-        categories = self._parse_categorization_response(response_text)
-
-        # Add categories to dataframe
-        startups_df = startups_df.copy()
-        startups_df["category"] = None
-        startups_df["subcategory"] = None
-        startups_df["themes"] = None
-
-        for item in categories:
-            idx = item["id"]
-            if idx < len(startups_df):
-                startups_df.at[idx, "category"] = item.get("category", "Other")
-                startups_df.at[idx, "subcategory"] = item.get("subcategory", "")
-                startups_df.at[idx, "themes"] = ", ".join(item.get("themes", []))
-
-        return startups_df
+    def categorize_startups_batch(self, startups_df: pd.DataFrame, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Categorize startups through the Message Batches API.
 
-    def _create_categorization_prompt(self, startups: List[Dict]) -> str:
-        """Create a prompt for Claude to categorize startups."""
-        startups_json = json.dumps(startups, indent=2)
+        Batches are billed at half the price of regular requests but are
+        processed asynchronously, so this blocks until the batch has ended.
 
-        prompt = f"""You are an expert at analyzing and categorizing startups by their business themes and focus areas.
+        Args:
+            startups_df: DataFrame with startup information
+            use_cache: Whether to reuse cached categories; False asks Claude
+                about every startup and refreshes the cache
 
-I have a list of startups with their descriptions. Please categorize each startup into appropriate themes using natural language understanding.
+        Returns:
+            DataFrame with added 'category' and 'subcategory' columns
+        """
+        return self._categorize(startups_df, force_batch=True, use_cache=use_cache)
+
+    def _categorize(self, startups_df: pd.DataFrame, force_batch: bool, use_cache: bool) -> pd.DataFrame:
+        """Categorize cache misses with Claude and merge them with cache hits."""
+        # Ids are row positions so results can be written back positionally
+        records = startups_df[["name", "description"]].to_dict("records")
+        keys = [_cache_key(r["name"], r["description"], self.label_version) for r in records]
+
+        with shelve.open(config.CATEGORY_CACHE_PATH) as cache:
+            categories = []
+            if use_cache:
+                categories = [{"id": i, **cache[key]} for i, key in enumerate(keys) if key in cache]
+            cached_ids = {item["id"] for item in categories}
+            misses = [i for i in range(len(records)) if i not in cached_ids]
+
+            print(f"Category cache: {len(cached_ids)} hit(s), {len(misses)} miss(es)")
+
+            vectors = None
+            if self.semantic_cache is not None and misses:
+                vectors = self.semantic_cache.encode([str(records[i]["description"]) for i in misses])
+            if vectors is not None and use_cache:
+                matches = self.semantic_cache.lookup(vectors)
+
+                for i, label in zip(misses, matches):
+                    if label is not None:
+                        cache[keys[i]] = label
+                        categories.append({"id": i, **label})
+
+                is_miss = [label is None for label in matches]
+                print(f"Semantic cache: {len(is_miss) - sum(is_miss)} hit(s), {sum(is_miss)} miss(es)")
+                misses = [i for i, miss in zip(misses, is_miss) if miss]
+                vectors = vectors[is_miss]
+
+            if misses:
+                chunks = self._create_chunks([{"id": i, **records[i]} for i in misses])
+
+                if force_batch or len(misses) > config.BATCH_API_THRESHOLD:
+                    print(f"Submitting {len(chunks)} categorization request(s) as a message batch...")
+                    new_categories = asyncio.run(self._categorize_chunks_batch(chunks))
+                    print("Received message batch results from Claude")
+                else:
+                    print(f"Sending {len(chunks)} categorization request(s) to Claude...")
+                    new_categories = asyncio.run(self._categorize_chunks(chunks))
+                    print("Received categorization responses from Claude")
+
+                labels = {}
+                pending = set(misses)
+                for item in new_categories:
+                    i = item.get("id")
+                    if i in pending:
+                        # The first answer for an id wins over any repeat
+                        pending.discard(i)
+                        labels[i] = {
+                            "category": item.get("category", "Other"),
+                            "subcategory": item.get("subcategory", ""),
+                            "themes": item.get("themes", [])
+                        }
+                        cache[keys[i]] = labels[i]
+
+                if vectors is not None:
+                    self.semantic_cache.add(
+                        vectors[[i in labels for i in misses]],
+                        [labels[i] for i in misses if i in labels]
+                    )
+                    self.semantic_cache.save()
+
+                # Only ids that were asked for; Claude may repeat or invent ids
+                categories.extend({"id": i, **label} for i, label in labels.items())
+
+        return self._apply_categories(startups_df, categories)
+
+    def _create_chunks(self, startups_list: List[Dict]) -> List[List[Dict]]:
+        """Split the startup data for Claude into mini-batches."""
+        # Claude tags small batches more reliably
+        batch_size = config.CATEGORIZATION_BATCH_SIZE
+        return [startups_list[i:i + batch_size]
+                for i in range(0, len(startups_list), batch_size)]
+
+    def _apply_categories(self, startups_df: pd.DataFrame, categories: List[Dict]) -> pd.DataFrame:
+        """Return a copy of the dataframe with Claude's categories added."""
+        n = len(startups_df)
+        category = np.full(n, "Other", dtype=object)
+        subcategory = np.empty(n, dtype=object)
+        themes = np.empty(n, dtype=object)
 
-For each startup, provide:
-1. A primary category (e.g., "AI Infrastructure", "Digital Health", "Developer Tools", "Fintech", "Enterprise Software", etc.)
-2. A subcategory (more specific classification)
-3. A list of relevant themes/tags
+        for item in categories:
+            i = item["id"]
+            if 0 <= i < n:
+                category[i] = item.get("category", "Other")
+                subcategory[i] = item.get("subcategory", "")
+                themes[i] = ", ".join(item.get("themes", []))
+
+        # Few distinct values, so categorical dtype saves memory and speeds up groupby
+        return startups_df.assign(
+            category=pd.Categorical(category),
+            subcategory=pd.Categorical(subcategory),
+            themes=themes
+        )
 
-Here are the startups:
+    async def _categorize_chunks(self, chunks: List[List[Dict]]) -> List[Dict]:
+        """Categorize all chunks concurrently and merge the results."""
+        semaphore = asyncio.Semaphore(config.CATEGORIZATION_CONCURRENCY)
+        total = sum(len(chunk) for chunk in chunks)
+        completed = 0
+
+        async def run(chunk):
+            nonlocal completed
+            async with semaphore:
+                result = await self._categorize_chunk(chunk)
+            completed += len(chunk)
+            print(f"  ✓ {completed}/{total} startups categorized")
+            return result
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [item for result in results for item in result]
+
+    async def _categorize_chunk(self, chunk: List[Dict]) -> List[Dict]:
+        """Send a single mini-batch of startups to Claude."""
+        return await self._call_claude(self._create_message_params(chunk))
+
+    async def _call_claude(self, params: Dict) -> List[Dict]:
+        """Stream categories from the Messages API, retrying transient failures with exponential backoff."""
+        for attempt in range(config.CLAUDE_MAX_RETRIES + 1):
+            try:
+                return await self._stream_categories(params)
+            except (anthropic.APITimeoutError, anthropic.APIStatusError) as e:
+                status_code = getattr(e, "status_code", None)
+                retryable = status_code is None or status_code == 429 or status_code >= 500
+                if not retryable or attempt == config.CLAUDE_MAX_RETRIES:
+                    raise
+
+                delay = 3 * 3 ** attempt
+                print(f"  Claude request failed ({e.__class__.__name__}), retrying in {delay}s...")
+                await asyncio.sleep(delay)
+
+    async def _stream_categories(self, params: Dict) -> List[Dict]:
+        """Stream a response, parsing each category object as soon as it is complete."""
+        decoder = json.JSONDecoder()
+        response = ""
+        pos = 0
+        categories = []
+
+        async with self.client.messages.stream(**params) as stream:
+            async for text in stream.text_stream:
+                response += text
+                pos = self._parse_streamed_objects(response, pos, decoder, categories)
+            message = await stream.get_final_message()
+
+        cache_read = getattr(message.usage, "cache_read_input_tokens", 0) or 0
+        cache_written = getattr(message.usage, "cache_creation_input_tokens", 0) or 0
+        print(f"Prompt cache: {cache_read} tokens read, {cache_written} tokens written")
+
+        # Anything left unparsed means the response was not a plain JSON array
+        if not categories or response.find("{", pos) != -1:
+            return self._parse_categorization_response(response)
+
+        return categories
+
+    def _parse_streamed_objects(self, response: str, pos: int,
+                                decoder: json.JSONDecoder, categories: List[Dict]) -> int:
+        """Append every complete JSON object after pos to categories and return the new position."""
+        while True:
+            start = response.find("{", pos)
+            if start == -1:
+                return pos
+
+            try:
+                item, end = decoder.raw_decode(response, start)
+            except json.JSONDecodeError:
+                # Incomplete object; retry once more text has arrived
+                return start
+
+            if isinstance(item, dict):
+                categories.append(item)
+            pos = end
+
+    async def _categorize_chunks_batch(self, chunks: List[List[Dict]]) -> List[Dict]:
+        """Submit all chunks as one message batch and collect the results."""
+        requests = [
+            {"custom_id": str(i), "params": self._create_message_params(chunk)}
+            for i, chunk in enumerate(chunks)
+        ]
+
+        batch = await self.client.messages.batches.create(requests=requests)
+        print(f"Created message batch {batch.id}")
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(config.BATCH_POLL_INTERVAL)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            print(f"  Batch status: {batch.processing_status} "
+                  f"({counts.succeeded} succeeded, {counts.processing} processing)")
+
+        categories = []
+        async for entry in await self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                categories.extend(
+                    self._parse_categorization_response(entry.result.message.content[0].text)
+                )
+            else:
+                print(f"✗ Batch request {entry.custom_id} {entry.result.type}")
 
-{startups_json}
+        return categories
 
-Please respond with a JSON array where each object contains:
-- id: the startup's id from the input
-- category: the primary category
-- subcategory: a more specific subcategory
-- themes: an array of relevant theme tags
+    def _create_message_params(self, chunk: List[Dict]) -> Dict:
+        """Build the Messages API parameters for a mini-batch of startups."""
+        # Only the startup JSON varies between requests
+        prompt = self._create_categorization_prompt(chunk)
 
-Focus on creating meaningful, consistent categories that help group similar companies together. Consider aspects like:
-- Technology focus (AI/ML, blockchain, cloud, etc.)
-- Industry vertical (healthcare, finance, education, etc.)
-- Target customer (B2B, B2C, developer tools, enterprise, etc.)
-- Problem space (productivity, infrastructure, security, etc.)
-
-Return ONLY the JSON array, no additional text."""
+        return {
+            "model": self.model,
+            "max_tokens": 4096,
+            "system": [
+                {
+                    "type": "text",
+                    "text": STATIC_INSTRUCTIONS,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
 
-        return prompt
+    def _create_categorization_prompt(self, startups: List[Dict]) -> str:
+        """Create the per-request user message holding the startups to categorize."""
+        # Short keys and no whitespace (orjson's only output) keep the input token count down
+        compact = [
+            {
+                "i": s["id"],
+                "n": s["name"],
+                "d": textwrap.shorten(s["description"], config.DESCRIPTION_MAX_CHARS, placeholder="...")
+                     if isinstance(s["description"], str) else ""
+            }
+            for s in startups
+        ]
+        return orjson.dumps(compact, default=str).decode()
 
     def _parse_categorization_response(self, response: str) -> List[Dict]:
         """Parse Claude's response to extract categorization data."""
@@ -119,11 +362,11 @@ Return ONLY the JSON array, no additional text."""
 
             if start_idx != -1 and end_idx > start_idx:
                 json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
+                return orjson.loads(json_str)
             else:
                 # If no JSON array found, try to parse the entire response
-                return json.loads(response)
-        except json.JSONDecodeError as e:
+                return orjson.loads(response)
+        except (orjson.JSONDecodeError, json.JSONDecodeError) as e:
             print(f"Error parsing JSON response: {e}")
             print(f"Response: {response}")
             return []
@@ -143,21 +386,18 @@ Return ONLY the JSON array, no additional text."""
 
         # Count themes
         if "themes" in categorized_df.columns:
-            all_themes = []
-            for themes_str in categorized_df["themes"].dropna():
-                if themes_str:
-                    themes = [t.strip() for t in themes_str.split(",")]
-                    all_themes.extend(themes)
-
-            from collections import Counter
-            theme_counts = Counter(all_themes)
-            summary["themes"] = dict(theme_counts.most_common(15))
+            themes = categorized_df["themes"].dropna().str.split(",").explode().str.strip()
+            theme_counts = themes[themes != ""].value_counts()
+            summary["themes"] = theme_counts.head(15).to_dict()
 
         return summary
 
 
 if __name__ == "__main__":
     from data_fetcher import StartupDataFetcher
+    from utils import configure_logging
+
+    configure_logging()
 
     # Load data
     fetcher = StartupDataFetcher()
@@ -177,5 +417,5 @@ if __name__ == "__main__":
     print(json.dumps(summary, indent=2))
 
     # Save results
-    categorized_df.to_csv("data/categorized_startups.csv", index=False)
-    print("\nResults saved to data/categorized_startups.csv")
+    categorized_df.to_parquet(config.CATEGORIZED_DATA_PATH, compression="zstd", index=False)
+    print(f"\nResults saved to {config.CATEGORIZED_DATA_PATH}")
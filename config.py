@@ -15,9 +15,28 @@ PRODUCTHUNT_TOKEN = os.getenv("PRODUCTHUNT_TOKEN")  # Optional
 # Using Claude 3 Haiku (fast and efficient model)
 CLAUDE_MODEL = "claude-3-haiku-20240307"
 
+# Categorization Configuration
+CATEGORIZATION_BATCH_SIZE = 20  # Startups per Claude request
+CATEGORIZATION_CONCURRENCY = 8  # Maximum Claude requests in flight
+DESCRIPTION_MAX_CHARS = 400  # Longer descriptions are truncated before sending
+BATCH_API_THRESHOLD = 200  # Use the Message Batches API above this many startups
+BATCH_POLL_INTERVAL = 30  # Seconds between Message Batch status checks
+CATEGORY_CACHE_PATH = "data/cache/category_cache"  # Persistent (name, description) -> category cache
+CLAUDE_MAX_RETRIES = 3  # Retries for throttled or failed requests (3s, 9s, 27s backoff)
+CATEGORIZED_DATA_PATH = "data/categorized_startups.parquet"  # Categorized output (keeps dtypes)
+CATEGORIZED_CSV_PATH = "data/categorized_startups.csv"  # Legacy CSV output, read if no Parquet exists
+
+# Semantic Cache (Optional: requires sentence-transformers)
+# Reuses categories for descriptions similar to ones already categorized
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "false").lower() == "true"
+SEMANTIC_CACHE_PATH = "data/cache/semantic_cache.npz"
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.90  # Minimum cosine similarity to reuse a category
+
 # Data Sources
 DATA_SOURCE = os.getenv("DATA_SOURCE", "hybrid")  # Options: 'local', 'url', 'sample', 'hybrid'
 DATA_SOURCE_URL = os.getenv("DATA_SOURCE_URL", None)  # CSV URL for live data
+EXPORT_COMBINED_CSV = os.getenv("EXPORT_COMBINED_CSV", "false").lower() == "true"  # Also write the hybrid dataset as CSV
 YC_COMPANIES_URL = "https://ycombinator.com/companies"
 SAMPLE_DATA_PATH = "data/sample_startups.csv"
 
@@ -1,13 +1,26 @@
 """Interactive dashboard for visualizing startup trends."""
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, dash_table, Input, Output, State, ClientsideFunction
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from typing import Optional
+from typing import Dict, Optional
 import config
-from utils import format_funding
+from utils import configure_logging, format_funding, format_funding_series
+
+# Startup details table columns and their display names
+TABLE_COLUMNS = {
+    "name": "Name",
+    "source": "Source",
+    "category": "Category",
+    "github_stars": "GitHub ⭐",
+    "funding_total": "Funding",
+    "founded_year": "Founded"
+}
+
+# Largest marker size in the funding scatter plot (plotly.express default)
+SCATTER_SIZE_MAX = 20
 
 
 class StartupDashboard:
@@ -16,10 +29,45 @@ class StartupDashboard:
     def __init__(self, data: pd.DataFrame):
         """Initialize dashboard with startup data."""
         self.data = data
+        self._categories = sorted(self.data["category"].dropna().unique().tolist())
+        self._n_categories = len(self._categories)
+        self._total_funding = self.data["funding_total"].sum()
+        self._aggregates = self._compute_aggregates()
+        self._figure_templates = self._build_figure_templates()
+        self._table_columns = [col for col in TABLE_COLUMNS if col in self.data.columns]
         self.app = dash.Dash(__name__, suppress_callback_exceptions=True)
         self.setup_layout()
         self.setup_callbacks()
 
+    def _compute_aggregates(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """Precompute the frames behind each view, keyed by category filter value."""
+        slices = [("all", self.data)] + list(self.data.groupby("category", sort=False, observed=True))
+
+        aggregates = {}
+        for category, filtered_data in slices:
+            # observed=True and the count filter drop categories absent from this slice
+            category_counts = filtered_data["category"].value_counts()
+            category_counts = category_counts[category_counts > 0].reset_index()
+            category_counts.columns = ["category", "count"]
+
+            funding_by_category = filtered_data.groupby("category", observed=True)["funding_total"].sum().reset_index()
+
+            themes = filtered_data["themes"].dropna().astype(str).str.split(",").explode().str.strip()
+            themes_df = themes[themes != ""].value_counts().head(10).reset_index()
+            themes_df.columns = ["theme", "count"]
+
+            scatter_data = filtered_data[["founded_year", "funding_total", "category", "name", "description"]].copy()
+            scatter_data["funding_millions"] = scatter_data["funding_total"] / 1e6
+
+            aggregates[category] = {
+                "category_counts": category_counts,
+                "funding_by_category": funding_by_category,
+                "themes": themes_df,
+                "scatter": scatter_data
+            }
+
+        return aggregates
+
     def setup_layout(self):
         """Set up the dashboard layout."""
         self.app.layout = html.Div([
@@ -46,7 +94,7 @@ class StartupDashboard:
 
                 html.Div([
                     html.Div([
-                        html.H3(f"{self.data['category'].nunique()}", style={"margin": "0", "color": "#e74c3c"}),
+                        html.H3(f"{self._n_categories}", style={"margin": "0", "color": "#e74c3c"}),
                         html.P("Categories", style={"margin": "5px 0 0 0", "color": "#7f8c8d"})
                     ], className="stat-box", style={
                         "backgroundColor": "#ecf0f1",
@@ -58,7 +106,7 @@ class StartupDashboard:
 
                 html.Div([
                     html.Div([
-                        html.H3(format_funding(self.data['funding_total'].sum()),
+                        html.H3(format_funding(self._total_funding),
                                style={"margin": "0", "color": "#27ae60"}),
                         html.P("Total Funding", style={"margin": "5px 0 0 0", "color": "#7f8c8d"})
                     ], className="stat-box", style={
@@ -76,7 +124,7 @@ class StartupDashboard:
                 dcc.Dropdown(
                     id="category-filter",
                     options=[{"label": "All Categories", "value": "all"}] +
-                            [{"label": cat, "value": cat} for cat in sorted(self.data["category"].unique())],
+                            [{"label": cat, "value": cat} for cat in self._categories],
                     value="all",
                     style={"marginBottom": "20px"}
                 ),
@@ -107,181 +155,212 @@ class StartupDashboard:
                 ], style={"width": "48%", "display": "inline-block", "padding": "10px"}),
             ], style={"marginBottom": "30px"}),
 
+            # Precomputed views for the clientside filter
+            dcc.Store(id="dashboard-figures", data={
+                category: self._build_figures(category, aggregates)
+                for category, aggregates in self._aggregates.items()
+            }),
+            dcc.Store(id="dashboard-table", data=self._build_table_records()),
+
             # Data Table
             html.Div([
                 html.H3("Startup Details", style={"textAlign": "center"}),
-                html.Div(id="startup-table")
+                dash_table.DataTable(
+                    id="startup-table",
+                    columns=[
+                        {"name": TABLE_COLUMNS[col], "id": col,
+                         "presentation": "markdown" if col == "name" else "input"}
+                        for col in self._table_columns
+                    ],
+                    markdown_options={"link_target": "_blank"},
+                    page_size=50,
+                    style_table={"marginTop": "20px"},
+                    style_header={"backgroundColor": "#3498db", "color": "white"},
+                    style_cell={"padding": "10px", "textAlign": "left", "fontFamily": "Arial, sans-serif"},
+                    style_data={"borderBottom": "1px solid #ddd"},
+                    css=[{"selector": ".dash-cell-value a", "rule": "color: #3498db; text-decoration: none;"},
+                         {"selector": ".dash-cell-value p", "rule": "margin: 0;"}]
+                )
             ], style={"marginTop": "30px"})
         ], style={"padding": "20px", "fontFamily": "Arial, sans-serif"})
 
+    @staticmethod
+    def _funding_display(funding_by_category: pd.DataFrame):
+        """Scale category funding for display, returning the sorted frame and axis label."""
+        funding_by_category = funding_by_category.copy()
+        # Use smart formatting: show in millions if < $1B, otherwise billions
+        total_funding = funding_by_category["funding_total"].sum()
+        if total_funding >= 1_000_000_000:
+            funding_by_category["funding_display"] = funding_by_category["funding_total"] / 1e9
+            funding_label = "Funding ($B)"
+        else:
+            funding_by_category["funding_display"] = funding_by_category["funding_total"] / 1e6
+            funding_label = "Funding ($M)"
+
+        return funding_by_category.sort_values("funding_display", ascending=True), funding_label
+
+    def _build_figure_templates(self) -> Dict[str, dict]:
+        """
+        Build each chart once with plotly.express on the unfiltered view.
+
+        The category views reuse these as templates and only swap in their own
+        trace data, which skips plotly.express validation and styling per view.
+
+        Returns:
+            Figure dicts keyed by chart name
+        """
+        aggregates = self._aggregates["all"]
+
+        # Category Pie Chart
+        pie_fig = px.pie(
+            aggregates["category_counts"],
+            values="count",
+            names="category",
+            title="Distribution by Category",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        pie_fig.update_traces(textposition="inside", textinfo="percent+label")
+
+        # Funding Bar Chart
+        funding_by_category, funding_label = self._funding_display(aggregates["funding_by_category"])
+        bar_fig = px.bar(
+            funding_by_category,
+            x="funding_display",
+            y="category",
+            orientation="h",
+            title="Total Funding by Category",
+            labels={"funding_display": funding_label, "category": "Category"},
+            color="funding_display",
+            color_continuous_scale="Viridis"
+        )
+
+        # Themes Chart
+        themes_fig = px.bar(
+            aggregates["themes"],
+            x="count",
+            y="theme",
+            orientation="h",
+            title="Most Common Themes",
+            labels={"count": "Count", "theme": "Theme"},
+            color="count",
+            color_continuous_scale="Blues"
+        )
+
+        # Funding Scatter Plot
+        scatter_fig = px.scatter(
+            aggregates["scatter"],
+            x="founded_year",
+            y="funding_millions",
+            size="funding_millions",
+            size_max=SCATTER_SIZE_MAX,
+            color="category",
+            hover_data=["name", "description"],
+            title="Funding vs Founded Year",
+            labels={"founded_year": "Founded Year", "funding_millions": "Funding ($M)"},
+            color_discrete_sequence=px.colors.qualitative.Plotly
+        )
+
+        return {
+            "pie": pie_fig.to_dict(),
+            "bar": bar_fig.to_dict(),
+            "themes": themes_fig.to_dict(),
+            "scatter": scatter_fig.to_dict()
+        }
+
+    def _build_figures(self, category: str, aggregates: Dict[str, pd.DataFrame]) -> list:
+        """
+        Build the four charts for one category view from the figure templates.
+
+        Args:
+            category: Category filter value, or "all"
+            aggregates: Precomputed frames for the view from _compute_aggregates
+
+        Returns:
+            Pie, funding bar, themes bar and scatter figures
+        """
+        templates = self._figure_templates
+        if category == "all":
+            return [go.Figure(templates[name]) for name in ("pie", "bar", "themes", "scatter")]
+
+        category_counts = aggregates["category_counts"]
+        pie_fig = go.Figure(templates["pie"])
+        pie_fig.update_traces(values=category_counts["count"], labels=category_counts["category"])
+
+        funding_by_category, funding_label = self._funding_display(aggregates["funding_by_category"])
+        bar_fig = go.Figure(templates["bar"])
+        bar_fig.update_traces(
+            x=funding_by_category["funding_display"],
+            y=funding_by_category["category"],
+            marker_color=funding_by_category["funding_display"],
+            hovertemplate=f"{funding_label}=%{{marker.color}}<br>Category=%{{y}}<extra></extra>"
+        )
+        bar_fig.update_layout(xaxis_title_text=funding_label, coloraxis_colorbar_title_text=funding_label)
+
+        themes = aggregates["themes"]
+        themes_fig = go.Figure(templates["themes"])
+        themes_fig.update_traces(x=themes["count"], y=themes["theme"], marker_color=themes["count"])
+
+        # The unfiltered scatter already has one trace per category; keep this
+        # category's trace, restyled as plotly.express would draw it alone
+        scatter_fig = go.Figure(templates["scatter"])
+        scatter_fig.data = [trace for trace in scatter_fig.data if trace.name == category]
+        scatter_fig.update_traces(
+            marker_color=px.colors.qualitative.Plotly[0],
+            marker_sizeref=aggregates["scatter"]["funding_millions"].max() / SCATTER_SIZE_MAX ** 2
+        )
+
+        return [pie_fig, bar_fig, themes_fig, scatter_fig]
+
+    def _build_table_records(self) -> list:
+        """Format every startup as a table row; the browser filters them by category."""
+        table_data = self.data[self._table_columns].copy()
+
+        # Format funding
+        if "funding_total" in table_data.columns:
+            table_data["funding_total"] = format_funding_series(table_data["funding_total"].fillna(0))
+
+        # Format github_stars
+        if "github_stars" in table_data.columns:
+            table_data["github_stars"] = table_data["github_stars"].fillna(0).apply(lambda x: f"{int(x):,}" if x > 0 else "N/A")
+
+        # Link names to their GitHub repo, falling back to the website
+        urls = pd.Series("", index=self.data.index)
+        for url_column in ["website", "github_url"]:
+            if url_column in self.data.columns:
+                column_urls = self.data[url_column].fillna("").astype(str)
+                urls = column_urls.where(column_urls != "", urls)
+
+        names = table_data["name"].astype(str)
+        table_data["name"] = ("[" + names + "](" + urls + ")").where(urls != "", names)
+
+        return table_data.to_dict("records")
+
     def setup_callbacks(self):
         """Set up interactive callbacks."""
-
-        @self.app.callback(
+        # Filtering runs in the browser (assets/filter.js): it swaps in the
+        # precomputed figures for the selected category and filters the table
+        # rows, so changing the dropdown never reaches the server
+        self.app.clientside_callback(
+            ClientsideFunction(namespace="filter", function_name="apply"),
             [Output("category-pie-chart", "figure"),
              Output("funding-bar-chart", "figure"),
              Output("themes-chart", "figure"),
              Output("funding-scatter", "figure"),
-             Output("startup-table", "children")],
-            [Input("category-filter", "value")]
+             Output("startup-table", "data")],
+            [Input("category-filter", "value")],
+            [State("dashboard-figures", "data"),
+             State("dashboard-table", "data")]
         )
-        def update_dashboard(selected_category):
-            # Filter data
-            if selected_category == "all":
-                filtered_data = self.data
-            else:
-                filtered_data = self.data[self.data["category"] == selected_category]
-
-            # Category Pie Chart
-            category_counts = filtered_data["category"].value_counts().reset_index()
-            category_counts.columns = ["category", "count"]
-
-            pie_fig = px.pie(
-                category_counts,
-                values="count",
-                names="category",
-                title="Distribution by Category",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            pie_fig.update_traces(textposition="inside", textinfo="percent+label")
-
-            # Funding Bar Chart
-            funding_by_category = filtered_data.groupby("category")["funding_total"].sum().reset_index()
-            # Use smart formatting: show in millions if < $1B, otherwise billions
-            total_funding = funding_by_category["funding_total"].sum()
-            if total_funding >= 1_000_000_000:
-                funding_by_category["funding_display"] = funding_by_category["funding_total"] / 1e9
-                funding_label = "Funding ($B)"
-                title_text = "Total Funding by Category"
-            else:
-                funding_by_category["funding_display"] = funding_by_category["funding_total"] / 1e6
-                funding_label = "Funding ($M)"
-                title_text = "Total Funding by Category"
-
-            funding_by_category = funding_by_category.sort_values("funding_display", ascending=True)
-
-            bar_fig = px.bar(
-                funding_by_category,
-                x="funding_display",
-                y="category",
-                orientation="h",
-                title=title_text,
-                labels={"funding_display": funding_label, "category": "Category"},
-                color="funding_display",
-                color_continuous_scale="Viridis"
-            )
-
-            # Themes Chart
-            all_themes = []
-            for themes_str in filtered_data["themes"].dropna():
-                if themes_str:
-                    themes = [t.strip() for t in str(themes_str).split(",")]
-                    all_themes.extend(themes)
-
-            from collections import Counter
-            theme_counts = Counter(all_themes)
-            top_themes = theme_counts.most_common(10)
-
-            themes_df = pd.DataFrame(top_themes, columns=["theme", "count"])
-            themes_fig = px.bar(
-                themes_df,
-                x="count",
-                y="theme",
-                orientation="h",
-                title="Most Common Themes",
-                labels={"count": "Count", "theme": "Theme"},
-                color="count",
-                color_continuous_scale="Blues"
-            )
-
-            # Funding Scatter Plot
-            scatter_data = filtered_data.copy()
-            scatter_data["funding_millions"] = scatter_data["funding_total"] / 1e6
-
-            scatter_fig = px.scatter(
-                scatter_data,
-                x="founded_year",
-                y="funding_millions",
-                size="funding_millions",
-                color="category",
-                hover_data=["name", "description"],
-                title="Funding vs Founded Year",
-                labels={"founded_year": "Founded Year", "funding_millions": "Funding ($M)"},
-                color_discrete_sequence=px.colors.qualitative.Plotly
-            )
-
-            # Data Table
-            # Select columns including source, github_stars
-            table_columns = ["name", "source", "category", "github_stars", "funding_total", "founded_year"]
-
-            # Only include columns that exist in the dataframe
-            available_columns = [col for col in table_columns if col in filtered_data.columns]
-            table_data = filtered_data[available_columns].copy()
-
-            # Format funding
-            if "funding_total" in table_data.columns:
-                table_data["funding_total"] = table_data["funding_total"].fillna(0).apply(format_funding)
-
-            # Format github_stars
-            if "github_stars" in table_data.columns:
-                table_data["github_stars"] = table_data["github_stars"].fillna(0).apply(lambda x: f"{int(x):,}" if x > 0 else "N/A")
-
-            # Rename columns for display
-            display_names = {
-                "name": "Name",
-                "source": "Source",
-                "category": "Category",
-                "github_stars": "GitHub ⭐",
-                "funding_total": "Funding",
-                "founded_year": "Founded"
-            }
-
-            # Create table with hyperlinks for name column
-            table_rows = []
-            for i in range(len(table_data)):
-                row_cells = []
-                for col in table_data.columns:
-                    if col == "name":
-                        # Create hyperlink for name
-                        name = table_data.iloc[i]["name"]
-                        # Get URL from github_url or website
-                        url = ""
-                        if "github_url" in filtered_data.columns:
-                            url = filtered_data.iloc[i].get("github_url", "")
-                        if not url and "website" in filtered_data.columns:
-                            url = filtered_data.iloc[i].get("website", "")
-
-                        if url:
-                            cell = html.Td(
-                                html.A(name, href=url, target="_blank",
-                                      style={"color": "#3498db", "textDecoration": "none"}),
-                                style={"padding": "10px", "borderBottom": "1px solid #ddd"}
-                            )
-                        else:
-                            cell = html.Td(name, style={"padding": "10px", "borderBottom": "1px solid #ddd"})
-                    else:
-                        cell = html.Td(
-                            table_data.iloc[i][col],
-                            style={"padding": "10px", "borderBottom": "1px solid #ddd"}
-                        )
-                    row_cells.append(cell)
-                table_rows.append(html.Tr(row_cells))
-
-            table = html.Table([
-                html.Thead(
-                    html.Tr([
-                        html.Th(display_names.get(col, col),
-                               style={"padding": "10px", "backgroundColor": "#3498db", "color": "white"})
-                        for col in table_data.columns
-                    ])
-                ),
-                html.Tbody(table_rows)
-            ], style={"width": "100%", "borderCollapse": "collapse", "marginTop": "20px"})
 
-            return pie_fig, bar_fig, themes_fig, scatter_fig, table
+    def run(self, host: str = None, port: int = None, debug: bool = False):
+        """
+        Run the dashboard with Dash's built-in development server.
 
-    def run(self, host: str = None, port: int = None, debug: bool = True):
-        """Run the dashboard server."""
+        Args:
+            host: Host to bind (defaults to config.DASHBOARD_HOST)
+            port: Port to bind (defaults to config.DASHBOARD_PORT)
+            debug: Enable the Flask debugger and Dash dev tools
+        """
         host = host or config.DASHBOARD_HOST
         port = port or config.DASHBOARD_PORT
 
@@ -290,14 +369,22 @@ class StartupDashboard:
         print(f"Dashboard URL: http://{host}:{port}")
         print(f"{'='*60}\n")
 
-        self.app.run(host=host, port=port, debug=debug)
+        self.app.run(host=host, port=port, debug=debug, dev_tools_hot_reload=False)
 
 
-if __name__ == "__main__":
-    # Load categorized data
+def load_categorized_data() -> pd.DataFrame:
+    """
+    Load categorized startups, running categorization first if none exist.
+
+    Returns:
+        DataFrame of categorized startups
+    """
     import os
 
-    data_path = "data/categorized_startups.csv"
+    # Prefer Parquet; the CSV is only read for data categorized before the switch
+    data_path = config.CATEGORIZED_DATA_PATH
+    if not os.path.exists(data_path) and os.path.exists(config.CATEGORIZED_CSV_PATH):
+        data_path = config.CATEGORIZED_CSV_PATH
 
     if not os.path.exists(data_path):
         print("Categorized data not found. Running categorization first...")
@@ -310,12 +397,32 @@ if __name__ == "__main__":
         categorizer = StartupCategorizer()
         df = categorizer.categorize_startups(df)
 
-        df.to_csv(data_path, index=False)
+        df.to_parquet(data_path, compression="zstd", index=False)
         print(f"Saved categorized data to {data_path}")
     else:
         print(f"Loading categorized data from {data_path}")
-        df = pd.read_csv(data_path)
+        if data_path.endswith(".parquet"):
+            df = pd.read_parquet(data_path)
+        else:
+            df = pd.read_csv(data_path, dtype={"category": "category", "subcategory": "category"})
+
+    return df
+
+
+def create_server():
+    """
+    Build the dashboard and return its Flask server for a WSGI server.
+
+    Usage:
+        gunicorn -w 4 -b 0.0.0.0:8050 "dashboard:create_server()"
+    """
+    return StartupDashboard(load_categorized_data()).app.server
+
+
+if __name__ == "__main__":
+    configure_logging()
 
-    # Create and run dashboard
-    dashboard = StartupDashboard(df)
+    # For production, serve with gunicorn instead:
+    #   gunicorn -w 4 -b 0.0.0.0:8050 "dashboard:create_server()"
+    dashboard = StartupDashboard(load_categorized_data())
     dashboard.run()
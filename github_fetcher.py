@@ -1,17 +1,101 @@
 """Fetch startup data from GitHub using their public API."""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from datetime import datetime, timedelta
-import time
-import json
+import orjson
+import logging
 import os
+import shelve
+import sqlite3
+import threading
+import time
+from utils import IO_BUFFER_SIZE, configure_logging, ensure_dir, migrate_csv_cache
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open to api.github.com, also the cap on concurrent requests
+HTTP_POOL_SIZE = 16
+
+# Search API fields kept by get_trending_startups, mapped to our column names
+REPO_COLUMNS = {
+    "owner.login": "name",
+    "name": "repo_name",
+    "description": "description",
+    "html_url": "github_url",
+    "homepage": "homepage",
+    "stargazers_count": "stars",
+    "forks_count": "forks",
+    "watchers_count": "watchers",
+    "open_issues_count": "open_issues",
+    "language": "language",
+    "topics": "topics",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "pushed_at": "last_push"
+}
+
+# Text columns stored as Arrow strings (compact, and compared without Python objects)
+REPO_TEXT_COLUMNS = [
+    "name", "repo_name", "description", "github_url", "homepage", "language",
+    "topics", "updated_at", "last_push"
+]
+
+# Values for search API fields missing from every result
+REPO_FIELD_DEFAULTS = {
+    "owner.login": "Unknown",
+    "name": "",
+    "description": "No description available",
+    "html_url": "",
+    "homepage": "",
+    "stargazers_count": 0,
+    "forks_count": 0,
+    "watchers_count": 0,
+    "open_issues_count": 0,
+    "language": "Unknown",
+    "topics": "",
+    "created_at": "",
+    "updated_at": "",
+    "pushed_at": ""
+}
+
+# Momentum score weights per repository metric
+MOMENTUM_WEIGHTS = {"stars": 1.0, "forks": 2.0, "watchers": 0.5}
+
+# Nanoseconds per day, for age calculations on int64 timestamps
+NS_PER_DAY = 86_400_000_000_000
+
+# Longest wait (seconds) for a GitHub rate limit reset; the search limit resets
+# every minute, the core API limit hourly
+RATE_LIMIT_MAX_WAIT = 60
+
+# Concurrent profile requests in enrich_with_org_data
+ENRICHMENT_CONCURRENCY = 8
+
+# Profile fields added by enrich_with_org_data: column -> (API key, default)
+ORG_FIELDS = {
+    "org_type": ("type", "User"),
+    "company": ("company", ""),
+    "location": ("location", ""),
+    "email": ("email", ""),
+    "bio": ("bio", ""),
+    "public_repos": ("public_repos", 0),
+    "followers": ("followers", 0)
+}
 
 
 class GitHubStartupFetcher:
     """Fetch trending startups and momentum metrics from GitHub."""
 
+    BASE_URL = "https://api.github.com"
+    SEARCH_URL = f"{BASE_URL}/search/repositories"
+
     def __init__(self, github_token: Optional[str] = None):
         """
         Initialize GitHub fetcher.
@@ -19,15 +103,109 @@ class GitHubStartupFetcher:
         Args:
             github_token: Optional GitHub personal access token for higher rate limits
         """
-        self.base_url = "https://api.github.com"
+        self.base_url = self.BASE_URL
         self.headers = {
             "Accept": "application/vnd.github.v3+json"
         }
         if github_token:
             self.headers["Authorization"] = f"token {github_token}"
 
+        # Shared session so concurrent requests reuse pooled connections;
+        # throttled and transient failures are retried with backoff
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503])
+        ))
+
         self.cache_dir = "data/cache"
-        os.makedirs(self.cache_dir, exist_ok=True)
+        ensure_dir(self.cache_dir)
+
+        # ETag -> search results store for conditional requests; shelve is not
+        # thread-safe, so concurrent topic searches share it under a lock
+        self._etag_path = os.path.join(self.cache_dir, "etag_cache")
+        self._etag_lock = threading.Lock()
+
+        # Cache metadata (one row per cached file) in a single SQLite database
+        self._db = sqlite3.connect(os.path.join(self.cache_dir, "cache.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, blob_path TEXT, last_updated INTEGER, row_count INTEGER)"
+        )
+
+    def _wait_for_rate_limit(self, response: requests.Response):
+        """
+        Sleep until the rate limit window resets if the last request used it up.
+
+        Waits longer than RATE_LIMIT_MAX_WAIT are skipped; the next request then
+        fails with a rate limit error instead of blocking.
+
+        Args:
+            response: Response carrying GitHub's X-RateLimit-* headers
+        """
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+
+        wait = int(response.headers.get("X-RateLimit-Reset", 0)) - time.time()
+        if wait > RATE_LIMIT_MAX_WAIT:
+            logger.warning("GitHub rate limit exhausted; resets in %.0f seconds", wait)
+        elif wait > 0:
+            logger.info("GitHub rate limit reached, waiting %.0f seconds", wait)
+            time.sleep(wait)
+
+    def _search_topic(self, topic: str, min_stars: int, date_threshold: str, base_params: Dict,
+                      etag_store: Optional[shelve.Shelf] = None) -> List[Dict]:
+        """
+        Search repositories for a single topic.
+
+        Sends If-None-Match with the ETag from the previous search for this
+        topic; a 304 reply reuses the stored results without a response body.
+
+        Args:
+            topic: Topic to search for
+            min_stars: Minimum number of stars
+            date_threshold: Only include repositories created after this date (YYYY-MM-DD)
+            base_params: Query parameters shared by every topic search
+            etag_store: Open ETag store, or None to always fetch
+
+        Returns:
+            List of repository dicts from the search API
+
+        Raises:
+            requests.RequestException: If the search request fails
+        """
+        params = {"q": f"topic:{topic} stars:>{min_stars} created:>{date_threshold}", **base_params}
+
+        # Keyed without the date: an ETag only matches identical results, so
+        # one entry per topic is enough and the store doesn't grow daily
+        cache_key = f"{topic}|{min_stars}|{base_params['per_page']}"
+        headers = {}
+        cached = None
+        if etag_store is not None:
+            with self._etag_lock:
+                cached = etag_store.get(cache_key)
+            if cached:
+                headers = {"If-None-Match": cached[0]}
+
+        response = self._session.get(self.SEARCH_URL, headers=headers, params=params, timeout=10)
+        self._wait_for_rate_limit(response)
+
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code == 403:
+            raise requests.HTTPError("Rate limit exceeded. Add GITHUB_TOKEN to .env for higher limits.")
+        response.raise_for_status()
+
+        repos = orjson.loads(response.content).get("items", [])
+        etag = response.headers.get("ETag")
+        if etag_store is not None and etag:
+            with self._etag_lock:
+                etag_store[cache_key] = (etag, repos)
+
+        return repos
 
     def get_trending_startups(self,
                              topics: List[str] = ["startup", "saas", "ai", "fintech"],
@@ -46,93 +224,80 @@ class GitHubStartupFetcher:
         Returns:
             DataFrame with startup repository data
         """
-        print(f"Fetching trending startups from GitHub...")
-        print(f"Topics: {', '.join(topics)}")
-        print(f"Minimum stars: {min_stars}")
-
-        all_repos = []
+        logger.info("Fetching trending startups from GitHub...")
+        logger.info("Topics: %s", ", ".join(topics))
+        logger.info("Minimum stars: %d", min_stars)
 
         # Calculate date threshold
         date_threshold = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        base_params = {"sort": "stars", "order": "desc", "per_page": min(100, limit)}
+
+        # Search all topics concurrently; results are combined in topic order
+        # so deduplication and the limit cut are deterministic
+        with closing(shelve.open(self._etag_path)) as etag_store, \
+                ThreadPoolExecutor(max_workers=max(1, min(len(topics), HTTP_POOL_SIZE))) as executor:
+            futures = {
+                executor.submit(self._search_topic, topic, min_stars, date_threshold, base_params, etag_store): topic
+                for topic in topics
+            }
 
-        for topic in topics:
-            try:
-                # Search for repositories
-                query = f"topic:{topic} stars:>{min_stars} created:>{date_threshold}"
-                url = f"{self.base_url}/search/repositories"
-                params = {
-                    "q": query,
-                    "sort": "stars",
-                    "order": "desc",
-                    "per_page": min(100, limit)
-                }
-
-                response = requests.get(url, headers=self.headers, params=params, timeout=10)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    repos = data.get("items", [])
-                    all_repos.extend(repos)
-                    print(f"  ✓ Found {len(repos)} repos for '{topic}'")
-
-                    # Respect rate limits
-                    time.sleep(1)
-                elif response.status_code == 403:
-                    print(f"  ✗ Rate limit exceeded. Add GITHUB_TOKEN to .env for higher limits.")
-                    break
-                else:
-                    print(f"  ✗ Error fetching '{topic}': {response.status_code}")
+            repos_by_topic = {}
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    repos_by_topic[topic] = future.result()
+                    logger.info("  ✓ Found %d repos for '%s'", len(repos_by_topic[topic]), topic)
+                except Exception as e:
+                    repos_by_topic[topic] = []
+                    logger.error("  ✗ Error with topic '%s': %s", topic, e)
+
+        frames = [pd.json_normalize(repos_by_topic[topic], max_level=1)
+                  for topic in topics if repos_by_topic[topic]]
+
+        if not frames:
+            logger.warning("No repositories found.")
+            return pd.DataFrame()
 
-            except Exception as e:
-                print(f"  ✗ Error with topic '{topic}': {e}")
+        # Convert to DataFrame, removing duplicates (repos can match several topics)
+        df = pd.concat(frames, ignore_index=True).drop_duplicates("id").head(limit)
+        for field, default in REPO_FIELD_DEFAULTS.items():
+            if field not in df.columns:
+                df[field] = default
+        df = df[list(REPO_COLUMNS)].rename(columns=REPO_COLUMNS)
+        df["topics"] = df["topics"].str.join(", ").fillna("")
+        df = df.astype(dict.fromkeys(REPO_TEXT_COLUMNS, "string[pyarrow]"))
+        # Parsed once here with the ISO 8601 fast path, so growth metrics don't re-parse
+        df["created_at"] = pd.to_datetime(df["created_at"], format="ISO8601", utc=True, cache=True)
+
+        # Calculate momentum score (simple weighted metric) as one matrix-vector product
+        if not df.empty:
+            metrics = df[list(MOMENTUM_WEIGHTS)].to_numpy(dtype=np.float64)
+            df["momentum_score"] = metrics @ np.array(list(MOMENTUM_WEIGHTS.values()))
+            df.sort_values("momentum_score", ascending=False, kind="stable", ignore_index=True, inplace=True)
 
-        if not all_repos:
-            print("No repositories found.")
-            return pd.DataFrame()
+        logger.info("✓ Found %d unique startup repositories", len(df))
 
-        # Remove duplicates
-        seen_ids = set()
-        unique_repos = []
-        for repo in all_repos:
-            if repo["id"] not in seen_ids:
-                seen_ids.add(repo["id"])
-                unique_repos.append(repo)
-
-        # Convert to DataFrame
-        startups = []
-        for repo in unique_repos[:limit]:
-            startup = {
-                "name": repo.get("owner", {}).get("login", "Unknown"),
-                "repo_name": repo.get("name", ""),
-                "description": repo.get("description", "No description available"),
-                "github_url": repo.get("html_url", ""),
-                "homepage": repo.get("homepage", ""),
-                "stars": repo.get("stargazers_count", 0),
-                "forks": repo.get("forks_count", 0),
-                "watchers": repo.get("watchers_count", 0),
-                "open_issues": repo.get("open_issues_count", 0),
-                "language": repo.get("language", "Unknown"),
-                "topics": ", ".join(repo.get("topics", [])),
-                "created_at": repo.get("created_at", ""),
-                "updated_at": repo.get("updated_at", ""),
-                "last_push": repo.get("pushed_at", ""),
-            }
-            startups.append(startup)
+        return df
 
-        df = pd.DataFrame(startups)
+    def _fetch_org(self, org_name: str) -> Optional[Dict]:
+        """
+        Fetch profile fields for a GitHub user or organization.
 
-        # Calculate momentum score (simple weighted metric)
-        if not df.empty:
-            df["momentum_score"] = (
-                df["stars"] * 1.0 +
-                df["forks"] * 2.0 +
-                df["watchers"] * 0.5
-            )
-            df = df.sort_values("momentum_score", ascending=False).reset_index(drop=True)
+        Args:
+            org_name: GitHub login
 
-        print(f"\n✓ Found {len(df)} unique startup repositories")
+        Returns:
+            Dict of ORG_FIELDS values, or None if the profile could not be fetched
+        """
+        url = f"{self.base_url}/users/{org_name}"
+        response = self._session.get(url, timeout=10)
+        self._wait_for_rate_limit(response)
 
-        return df
+        if response.status_code != 200:
+            return None
+
+        org_data = orjson.loads(response.content)
+        return {field: org_data.get(key, default) for field, (key, default) in ORG_FIELDS.items()}
 
     def enrich_with_org_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -144,43 +309,41 @@ class GitHubStartupFetcher:
         Returns:
             Enriched DataFrame
         """
-        print("\nEnriching with organization data...")
-
-        enriched_data = []
-
-        for idx, row in df.iterrows():
-            org_name = row["name"]
-
-            try:
-                # Fetch organization data
-                url = f"{self.base_url}/users/{org_name}"
-                response = requests.get(url, headers=self.headers, timeout=10)
-
-                if response.status_code == 200:
-                    org_data = response.json()
-
-                    row["org_type"] = org_data.get("type", "User")
-                    row["company"] = org_data.get("company", "")
-                    row["location"] = org_data.get("location", "")
-                    row["email"] = org_data.get("email", "")
-                    row["bio"] = org_data.get("bio", "")
-                    row["public_repos"] = org_data.get("public_repos", 0)
-                    row["followers"] = org_data.get("followers", 0)
-
-                    print(f"  ✓ Enriched {org_name}")
+        logger.info("Enriching with organization data...")
+
+        # Each login is fetched once, concurrently, and the results joined back
+        # onto every row with that name
+        names = df["name"].dropna().unique().tolist()
+        orgs = {}
+
+        with ThreadPoolExecutor(max_workers=ENRICHMENT_CONCURRENCY) as executor:
+            futures = {executor.submit(self._fetch_org, org_name): org_name for org_name in names}
+            for future in as_completed(futures):
+                org_name = futures[future]
+                try:
+                    org = future.result()
+                except Exception as e:
+                    logger.error("  ✗ Error enriching %s: %s", org_name, e)
+                    continue
+
+                if org is None:
+                    logger.warning("  ✗ Could not fetch org data for %s", org_name)
                 else:
-                    print(f"  ✗ Could not fetch org data for {org_name}")
-
-                enriched_data.append(row)
+                    orgs[org_name] = org
+                    logger.info("  ✓ Enriched %s", org_name)
 
-                # Respect rate limits
-                time.sleep(0.5)
+        enriched = df.copy()
+        if not orgs:
+            return enriched
 
-            except Exception as e:
-                print(f"  ✗ Error enriching {org_name}: {e}")
-                enriched_data.append(row)
+        org_df = pd.DataFrame.from_dict(orgs, orient="index")
+        has_org = enriched["name"].isin(org_df.index)
+        for field in ORG_FIELDS:
+            values = enriched["name"].map(org_df[field])
+            # Rows whose fetch failed keep any value they already had
+            enriched[field] = values.where(has_org, enriched[field]) if field in enriched.columns else values
 
-        return pd.DataFrame(enriched_data)
+        return enriched
 
     def calculate_growth_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -195,62 +358,103 @@ class GitHubStartupFetcher:
         if df.empty:
             return df
 
-        # Calculate days since creation
-        df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-        df["days_old"] = (pd.Timestamp.now(tz='UTC') - df["created_at"]).dt.days
-
-        # Calculate star velocity (stars per day)
-        df["star_velocity"] = df["stars"] / df["days_old"].replace(0, 1)
+        # Calculate days since creation on raw int64 nanoseconds; missing
+        # timestamps (NaT) give NaN like the .dt.days accessor would
+        if not isinstance(df["created_at"].dtype, pd.DatetimeTZDtype):
+            # Frames from older caches still hold timestamp strings
+            df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+        created_ns = df["created_at"].to_numpy(dtype="datetime64[ns]").view("i8")
+        days_old = (pd.Timestamp.now(tz="UTC").value - created_ns) // NS_PER_DAY
+        missing = df["created_at"].isna().to_numpy()
+        df["days_old"] = np.where(missing, np.nan, days_old) if missing.any() else days_old
+
+        # Calculate star velocity (stars per day), counting day-old repos as one day
+        days = df["days_old"].to_numpy()
+        stars = df["stars"].to_numpy()
+        df["star_velocity"] = stars / np.where(days == 0, 1, days)
 
         # Calculate fork ratio
-        df["fork_ratio"] = df["forks"] / df["stars"].replace(0, 1)
+        df["fork_ratio"] = df["forks"].to_numpy() / np.where(stars == 0, 1, stars)
 
         return df
 
-    def save_to_cache(self, df: pd.DataFrame, filename: str = "github_startups.csv"):
+    def _read_legacy_metadata(self, filename: str) -> Optional[float]:
+        """
+        Move a "<file>.meta.json" written before the metadata table existed into it.
+
+        Args:
+            filename: Cache file name
+
+        Returns:
+            Last-updated Unix timestamp, or None if there is no legacy metadata
+        """
+        cache_path = os.path.join(self.cache_dir, filename)
+        metadata_path = f"{cache_path}.meta.json"
+        if not os.path.exists(metadata_path):
+            return None
+
+        with open(metadata_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            metadata = orjson.loads(f.read())
+        last_updated = datetime.fromisoformat(metadata["last_updated"]).timestamp()
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, blob_path, last_updated, row_count) VALUES (?, ?, ?, ?)",
+                (filename, cache_path, int(last_updated), metadata.get("record_count"))
+            )
+        os.remove(metadata_path)
+
+        return last_updated
+
+    def save_to_cache(self, df: pd.DataFrame, filename: str = "github_startups.parquet"):
         """Save data to cache."""
         cache_path = os.path.join(self.cache_dir, filename)
-        df.to_csv(cache_path, index=False)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
 
         # Save metadata
-        metadata = {
-            "last_updated": datetime.now().isoformat(),
-            "record_count": len(df),
-            "source": "GitHub API"
-        }
-        metadata_path = os.path.join(self.cache_dir, f"{filename}.meta.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, blob_path, last_updated, row_count) VALUES (?, ?, ?, ?)",
+                (filename, cache_path, int(time.time()), len(df))
+            )
 
-        print(f"\n✓ Cached data to {cache_path}")
+        logger.info("✓ Cached data to %s", cache_path)
 
-    def load_from_cache(self, filename: str = "github_startups.csv",
+    def load_from_cache(self, filename: str = "github_startups.parquet",
                        max_age_hours: int = 24) -> Optional[pd.DataFrame]:
         """Load data from cache if it exists and is recent."""
-        cache_path = os.path.join(self.cache_dir, filename)
-        metadata_path = os.path.join(self.cache_dir, f"{filename}.meta.json")
-
-        if not os.path.exists(cache_path):
-            return None
+        migrate_csv_cache(os.path.join(self.cache_dir, filename))
 
         # Check metadata
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-
-            last_updated = datetime.fromisoformat(metadata["last_updated"])
-            age_hours = (datetime.now() - last_updated).total_seconds() / 3600
-
-            if age_hours <= max_age_hours:
-                print(f"Loading cached data (age: {age_hours:.1f} hours)")
-                return pd.read_csv(cache_path)
-            else:
-                print(f"Cache expired (age: {age_hours:.1f} hours > {max_age_hours} hours)")
+        row = self._db.execute(
+            "SELECT blob_path, last_updated FROM cache WHERE key = ?", (filename,)
+        ).fetchone()
+        if row is None:
+            last_updated = self._read_legacy_metadata(filename)
+            if last_updated is None:
+                return None
+            row = (os.path.join(self.cache_dir, filename), last_updated)
+
+        blob_path, last_updated = row
+        age_hours = (time.time() - last_updated) / 3600
+
+        if age_hours <= max_age_hours:
+            # A missing file is found by the read itself rather than a separate stat
+            try:
+                df = pd.read_parquet(blob_path)
+            except FileNotFoundError:
+                return None
+            logger.info("Loading cached data (age: %.1f hours)", age_hours)
+            return df
+        else:
+            logger.info("Cache expired (age: %.1f hours > %s hours)", age_hours, max_age_hours)
 
         return None
 
 
 if __name__ == "__main__":
+    configure_logging()
+
     # Test the GitHub fetcher
     fetcher = GitHubStartupFetcher()
 
@@ -2,12 +2,187 @@
 
 import pandas as pd
 from typing import Optional, Dict, List
-from datetime import datetime
 import os
-import json
+import re
+from rapidfuzz import fuzz, process, utils as fuzz_utils
 
 from github_fetcher import GitHubStartupFetcher
 from producthunt_fetcher import ProductHuntFetcher
+from utils import ensure_dir
+
+# Columns of the merged dataset, in output order
+MERGED_COLUMNS = [
+    "name", "description", "source", "github_url", "website", "github_stars",
+    "github_forks", "star_velocity", "momentum_score", "language", "topics",
+    "founded_year", "funding_total", "location", "ph_upvotes", "ph_comments",
+    "launch_date"
+]
+
+# GitHub repository column -> merged column
+GITHUB_COLUMNS = {
+    "name": "name",
+    "description": "description",
+    "github_url": "github_url",
+    "homepage": "website",
+    "stars": "github_stars",
+    "forks": "github_forks",
+    "star_velocity": "star_velocity",
+    "momentum_score": "momentum_score",
+    "language": "language",
+    "topics": "topics",
+    "location": "location"
+}
+
+# Product Hunt launch column -> merged column
+PRODUCTHUNT_COLUMNS = {
+    "name": "name",
+    "tagline": "description",
+    "website": "website",
+    "topics": "topics",
+    "upvotes": "ph_upvotes",
+    "comments": "ph_comments",
+    "launch_date": "launch_date"
+}
+
+# Values for merged columns a source doesn't provide
+_COMMON_DEFAULTS = {
+    "description": "",
+    "github_url": "",
+    "website": "",
+    "github_stars": 0,
+    "github_forks": 0,
+    "star_velocity": 0,
+    "momentum_score": 0,
+    "language": "",
+    "topics": "",
+    "funding_total": 0,  # To be manually enriched
+    "location": ""
+}
+GITHUB_DEFAULTS = {**_COMMON_DEFAULTS, "source": "GitHub"}
+PRODUCTHUNT_DEFAULTS = {
+    **_COMMON_DEFAULTS,
+    "source": "Product Hunt",
+    "ph_upvotes": 0,
+    "ph_comments": 0,
+    "launch_date": ""
+}
+
+# Compact numeric dtypes for the merged dataset; Product Hunt counts are
+# nullable because GitHub-only entries have none
+MERGED_DTYPES = {
+    "github_stars": "int32",
+    "github_forks": "int32",
+    "star_velocity": "float32",
+    "momentum_score": "float32",
+    "ph_upvotes": "Int32",
+    "ph_comments": "Int32",
+    "combined_momentum": "float32"
+}
+
+# Low-cardinality text columns stored as categoricals in the combined dataset
+CATEGORICAL_COLUMNS = ["source", "language", "last_funding_round", "location"]
+
+# Name keys collapse punctuation runs to a space and drop a trailing
+# company-form suffix ("Acme Inc.", "Cera Limited")
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+_COMPANY_SUFFIX = re.compile(r" (?:limited|ltd|llc|inc|incorporated|corp|corporation|co|company)$")
+
+# Minimum token_sort_ratio for two differently written names to be the same startup
+FUZZY_MATCH_CUTOFF = 85
+
+
+def _project(df: pd.DataFrame, columns: Dict[str, str], defaults: Dict,
+             founded_from: str) -> pd.DataFrame:
+    """
+    Map one source's columns onto the merged schema.
+
+    Args:
+        df: Source data
+        columns: Source column -> merged column
+        defaults: Values for merged columns missing from the source
+        founded_from: Source date column the founded year is taken from
+
+    Returns:
+        DataFrame with the source's merged columns, in output order
+    """
+    projected = df[[col for col in columns if col in df.columns]].rename(columns=columns)
+    projected = projected.assign(
+        founded_year=_year(df.get(founded_from)),
+        **{col: value for col, value in defaults.items() if col not in projected.columns}
+    )
+    return projected[[col for col in MERGED_COLUMNS if col in projected.columns]]
+
+
+def _name_key(names: pd.Series) -> pd.Series:
+    """
+    Normalize startup names for matching.
+
+    Lowercases, collapses punctuation to single spaces and drops a trailing
+    company-form suffix, so "Cursor-AI" and "Cursor AI, Inc." share a key.
+
+    Args:
+        names: Startup names
+
+    Returns:
+        Series of name keys (the lowercased name if nothing else is left)
+    """
+    lowered = names.str.lower()
+    keys = (
+        lowered.str.replace(_NON_ALPHANUMERIC, " ", regex=True)
+        .str.strip()
+        .str.replace(_COMPANY_SUFFIX, "", regex=True)
+    )
+    return keys.where(keys != "", lowered)
+
+
+def _match_names(names: pd.Series, targets: pd.Index) -> pd.Series:
+    """
+    Find the target each name key refers to.
+
+    Exact matches are taken first. The remaining names are compared with
+    rapidfuzz (ignoring punctuation and word order) only against targets
+    sharing their first character, which keeps the score matrices small.
+
+    Args:
+        names: Name keys to look up
+        targets: Unique name keys to match against
+
+    Returns:
+        Series aligned with names holding the matched target, or NaN
+    """
+    matches = names.where(names.isin(targets))
+    unmatched = names[matches.isna()]
+    if unmatched.empty or targets.empty:
+        return matches
+
+    target_blocks = pd.Series(targets, index=targets).groupby(targets.str[:1])
+    for initial, block in unmatched.groupby(unmatched.str[:1]):
+        if initial not in target_blocks.groups:
+            continue
+        candidates = target_blocks.get_group(initial).to_numpy()
+        scores = process.cdist(block.tolist(), candidates.tolist(), scorer=fuzz.token_sort_ratio,
+                               processor=fuzz_utils.default_process,
+                               score_cutoff=FUZZY_MATCH_CUTOFF, workers=-1)
+        # Scores below the cutoff come back as 0
+        found = scores.max(axis=1) > 0
+        matches[block.index[found]] = candidates[scores.argmax(axis=1)[found]]
+
+    return matches
+
+
+def _year(dates: Optional[pd.Series]) -> Optional[pd.Series]:
+    """
+    Extract the year from a column of dates.
+
+    Args:
+        dates: Dates as datetimes or strings, or None if the column is missing
+
+    Returns:
+        Series of years (NaN where a date is missing), or None
+    """
+    if dates is None:
+        return None
+    return pd.to_datetime(dates, errors="coerce", utc=True).dt.year
 
 
 class HybridStartupFetcher:
@@ -25,7 +200,7 @@ class HybridStartupFetcher:
         self.github_fetcher = GitHubStartupFetcher(github_token)
         self.ph_fetcher = ProductHuntFetcher(ph_token)
         self.cache_dir = "data/cache"
-        os.makedirs(self.cache_dir, exist_ok=True)
+        ensure_dir(self.cache_dir)
 
     def fetch_all_sources(self,
                          use_github: bool = True,
@@ -109,81 +284,61 @@ class HybridStartupFetcher:
         print("MERGING DATASETS")
         print("="*80)
 
-        all_startups = []
+        frames = []
+        github_keys = pd.Series(dtype="string")
 
-        # Process GitHub startups
+        # Project GitHub repositories onto the combined schema
         if not github_df.empty:
-            for _, row in github_df.iterrows():
-                startup = {
-                    "name": row["name"],
-                    "description": row.get("description", ""),
-                    "source": "GitHub",
-                    "github_url": row.get("github_url", ""),
-                    "website": row.get("homepage", ""),
-                    "github_stars": row.get("stars", 0),
-                    "github_forks": row.get("forks", 0),
-                    "star_velocity": row.get("star_velocity", 0),
-                    "momentum_score": row.get("momentum_score", 0),
-                    "language": row.get("language", ""),
-                    "topics": row.get("topics", ""),
-                    "founded_year": pd.to_datetime(row.get("created_at", "")).year if pd.notnull(row.get("created_at")) else None,
-                    "funding_total": 0,  # To be manually enriched
-                    "location": row.get("location", ""),
-                }
-                all_startups.append(startup)
-
-        # Process Product Hunt launches
+            github = _project(github_df, GITHUB_COLUMNS, GITHUB_DEFAULTS, "created_at")
+            github_keys = _name_key(github["name"])
+            frames.append(github)
+
+        # Project Product Hunt launches, merging matches into GitHub entries
         if not ph_df.empty:
-            for _, row in ph_df.iterrows():
-                # Check if already exists from GitHub
-                existing = next((s for s in all_startups if s["name"].lower() == row["name"].lower()), None)
-
-                if existing:
-                    # Merge with existing entry
-                    existing["ph_upvotes"] = row.get("upvotes", 0)
-                    existing["ph_comments"] = row.get("comments", 0)
-                    existing["launch_date"] = row.get("launch_date", "")
-                    if not existing["website"]:
-                        existing["website"] = row.get("website", "")
-                    if not existing["description"]:
-                        existing["description"] = row.get("tagline", "")
-                else:
-                    # Add as new entry
-                    startup = {
-                        "name": row["name"],
-                        "description": row.get("tagline", ""),
-                        "source": "Product Hunt",
-                        "github_url": "",
-                        "website": row.get("website", ""),
-                        "github_stars": 0,
-                        "github_forks": 0,
-                        "star_velocity": 0,
-                        "momentum_score": 0,
-                        "language": "",
-                        "topics": row.get("topics", ""),
-                        "founded_year": pd.to_datetime(row.get("launch_date", "")).year if pd.notnull(row.get("launch_date")) else None,
-                        "funding_total": 0,
-                        "location": "",
-                        "ph_upvotes": row.get("upvotes", 0),
-                        "ph_comments": row.get("comments", 0),
-                        "launch_date": row.get("launch_date", ""),
-                    }
-                    all_startups.append(startup)
-
-        df = pd.DataFrame(all_startups)
+            launches = _project(ph_df, PRODUCTHUNT_COLUMNS, PRODUCTHUNT_DEFAULTS, "launch_date")
+            # Launches key on the GitHub name they match, if any; repeated
+            # keys update the same entry, so the last launch wins
+            launch_keys = _name_key(launches["name"])
+            github_matches = _match_names(launch_keys, pd.Index(github_keys.unique()))
+            launch_keys = github_matches.fillna(launch_keys)
+            keep = ~launch_keys.duplicated(keep="last")
+            launches, launch_keys, github_matches = launches[keep], launch_keys[keep], github_matches[keep]
+
+            if frames:
+                # Launches only merge into the first GitHub entry they match
+                by_key = launches[github_matches.notna()].set_index(launch_keys[github_matches.notna()])
+                match_keys = github_keys.mask(github_keys.duplicated())
+                matched = match_keys.isin(by_key.index)
+                # Reindexing keeps each column's dtype even when no launch matched
+                launch_values = by_key.reindex(match_keys)
+                for col in ("ph_upvotes", "ph_comments", "launch_date"):
+                    github[col] = launch_values[col].to_numpy()
+                for col in ("website", "description"):
+                    # GitHub text columns are Arrow strings, where missing values are pd.NA
+                    empty = github[col].isna() | github[col].astype(str).eq("")
+                    github[col] = github[col].mask(matched & empty, launch_values[col].to_numpy())
+
+            frames.append(launches[github_matches.isna()])
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
         # Calculate combined momentum score
         if not df.empty:
+            # Engagement columns are missing entirely when nothing came from Product Hunt
+            engagement = df.reindex(columns=["ph_upvotes", "ph_comments"]).fillna(0)
             df["combined_momentum"] = (
-                df.get("momentum_score", 0) +
-                (df.get("ph_upvotes", 0).fillna(0) * 0.5) +
-                (df.get("ph_comments", 0).fillna(0) * 1.0)
+                df["momentum_score"].fillna(0) +
+                (engagement["ph_upvotes"] * 0.5) +
+                (engagement["ph_comments"] * 1.0)
             )
-            df = df.sort_values("combined_momentum", ascending=False).reset_index(drop=True)
+            df = df.astype({col: dtype for col, dtype in MERGED_DTYPES.items() if col in df.columns})
+            # Stable, so entries with equal momentum keep their source order
+            df.sort_values("combined_momentum", ascending=False, kind="stable", ignore_index=True, inplace=True)
 
         print(f"✓ Merged {len(df)} unique startups")
-        print(f"  - GitHub sources: {len([s for s in all_startups if 'GitHub' in s.get('source', '')])}")
-        print(f"  - Product Hunt sources: {len([s for s in all_startups if s.get('source') == 'Product Hunt'])}")
+        if not df.empty:
+            print(f"  - GitHub sources: {(df['source'] == 'GitHub').sum()}")
+            print(f"  - Product Hunt sources: {(df['source'] == 'Product Hunt').sum()}")
 
         return df
 
@@ -231,26 +386,30 @@ class HybridStartupFetcher:
 
         print("\nApplying manual enrichment...")
 
-        for _, enrich_row in enrichment_df.iterrows():
-            name = enrich_row["name"]
-
-            # Find matching startup
-            mask = df["name"].str.lower() == name.lower()
+        # Enrichment rows key on the startup name they match; later rows for
+        # the same startup override earlier ones
+        keys = _name_key(df["name"])
+        enrich_keys = _match_names(_name_key(enrichment_df["name"]), pd.Index(keys.unique()))
+        latest = enrich_keys.notna() & ~enrich_keys.duplicated(keep="last")
+        by_key = enrichment_df[latest].set_index(enrich_keys[latest])
 
-            if mask.any():
-                # Update with enrichment data
-                for col in enrichment_df.columns:
-                    if col != "name" and col in df.columns:
-                        df.loc[mask, col] = enrich_row[col]
+        # Update matching startups with enrichment data
+        matched = keys.isin(by_key.index)
+        matched_keys = keys[matched]
+        for col in enrichment_df.columns:
+            if col != "name" and col in df.columns:
+                df.loc[matched, col] = matched_keys.map(by_key[col])
 
-                print(f"  ✓ Enriched {name}")
+        for name in enrichment_df.loc[enrich_keys.notna(), "name"]:
+            print(f"  ✓ Enriched {name}")
 
         return df
 
     def get_combined_data(self,
                          use_cache: bool = True,
                          cache_max_age_hours: int = 24,
-                         apply_enrichment: bool = True) -> pd.DataFrame:
+                         apply_enrichment: bool = True,
+                         export_csv: bool = False) -> pd.DataFrame:
         """
         Get complete combined dataset from all sources.
 
@@ -258,6 +417,7 @@ class HybridStartupFetcher:
             use_cache: Whether to use cached data
             cache_max_age_hours: Maximum cache age in hours
             apply_enrichment: Whether to apply manual enrichment
+            export_csv: Whether to also save the dataset as CSV
 
         Returns:
             Complete startup dataset
@@ -282,24 +442,26 @@ class HybridStartupFetcher:
             if not enrichment_df.empty:
                 df = self.apply_manual_enrichment(df, enrichment_df)
 
+        # Converted after enrichment, which may write values outside the categories
+        df = df.astype({col: "category" for col in CATEGORICAL_COLUMNS if col in df.columns})
+
         # Save combined dataset
-        self.save_combined_data(df)
+        self.save_combined_data(df, export_csv=export_csv)
 
         return df
 
-    def save_combined_data(self, df: pd.DataFrame):
-        """Save combined dataset to cache."""
-        cache_path = os.path.join(self.cache_dir, "combined_startups.csv")
-        df.to_csv(cache_path, index=False)
+    def save_combined_data(self, df: pd.DataFrame, export_csv: bool = False):
+        """
+        Save combined dataset to cache.
 
-        metadata = {
-            "last_updated": datetime.now().isoformat(),
-            "record_count": len(df),
-            "sources": ["GitHub", "Product Hunt", "Manual Enrichment"]
-        }
-        metadata_path = os.path.join(self.cache_dir, "combined_startups.csv.meta.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        Args:
+            df: Combined startup dataset
+            export_csv: Whether to also write a CSV copy for inspection
+        """
+        cache_path = os.path.join(self.cache_dir, "combined_startups.parquet")
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+        if export_csv:
+            df.to_csv(os.path.join(self.cache_dir, "combined_startups.csv"), index=False)
 
         print(f"\n✓ Saved combined dataset to {cache_path}")
 
@@ -307,6 +469,9 @@ class HybridStartupFetcher:
 if __name__ == "__main__":
     # Test the hybrid fetcher
     import os
+    from utils import configure_logging
+
+    configure_logging()
 
     github_token = os.getenv("GITHUB_TOKEN")
     fetcher = HybridStartupFetcher(github_token=github_token)
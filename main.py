@@ -9,10 +9,9 @@ and displays an interactive dashboard with trends and insights.
 import sys
 import argparse
 from data_fetcher import StartupDataFetcher
-from categorizer import StartupCategorizer
-from dashboard import StartupDashboard
 import pandas as pd
 import os
+from utils import configure_logging
 
 
 def main():
@@ -31,6 +30,11 @@ def main():
         default=8050,
         help="Port to run the dashboard server (default: 8050)"
     )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Run the dashboard with the Flask debugger and Dash dev tools"
+    )
     parser.add_argument(
         "--no-dashboard",
         action="store_true",
@@ -39,6 +43,9 @@ def main():
 
     args = parser.parse_args()
 
+    # Data fetchers report progress through logging
+    configure_logging()
+
     print("\n" + "="*70)
     print("  STARTUP TRENDS DASHBOARD")
     print("  Powered by Claude AI")
@@ -71,19 +78,23 @@ def main():
     print(f"✓ Loaded {len(df)} startups\n")
 
     # Step 2: Categorize with Claude
-    categorized_data_path = "data/categorized_startups.csv"
+    categorized_data_path = config.CATEGORIZED_DATA_PATH
+    has_cached_data = os.path.exists(categorized_data_path) or os.path.exists(config.CATEGORIZED_CSV_PATH)
 
-    if args.recategorize or not os.path.exists(categorized_data_path):
+    if args.recategorize or not has_cached_data:
         print("Step 2: Categorizing startups with Claude AI...")
         print("-" * 70)
         print("This may take a moment as Claude analyzes each startup...\n")
 
         try:
+            # Imported here: the Anthropic client is only needed when categorizing
+            from categorizer import StartupCategorizer
+
             categorizer = StartupCategorizer()
-            df = categorizer.categorize_startups(df)
+            df = categorizer.categorize_startups(df, use_cache=not args.recategorize)
 
             # Save categorized data
-            df.to_csv(categorized_data_path, index=False)
+            df.to_parquet(categorized_data_path, compression="zstd", index=False)
             print(f"✓ Categorization complete!")
             print(f"✓ Results saved to {categorized_data_path}\n")
 
@@ -102,7 +113,10 @@ def main():
     else:
         print("Step 2: Loading cached categorization data...")
         print("-" * 70)
-        df = pd.read_csv(categorized_data_path)
+        if os.path.exists(categorized_data_path):
+            df = pd.read_parquet(categorized_data_path)
+        else:
+            df = pd.read_csv(config.CATEGORIZED_CSV_PATH, dtype={"category": "category", "subcategory": "category"})
         print(f"✓ Loaded categorized data from cache")
         print(f"  (Use --recategorize to force new categorization)\n")
 
@@ -117,8 +131,11 @@ def main():
     print("-" * 70)
 
     try:
+        # Imported here so --help and --no-dashboard don't load Dash and Plotly
+        from dashboard import StartupDashboard
+
         dashboard = StartupDashboard(df)
-        dashboard.run(port=args.port)
+        dashboard.run(port=args.port, debug=args.debug)
     except KeyboardInterrupt:
         print("\n\n✓ Dashboard shut down gracefully.")
     except Exception as e:
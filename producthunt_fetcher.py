@@ -1,12 +1,87 @@
 """Fetch new startup launches from Product Hunt."""
 
 import requests
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import json
 import os
 import time
+from functools import lru_cache
+
+from utils import ensure_dir
+
+# Sample launches used until a Product Hunt API integration is set up
+SAMPLE_PRODUCTS = [
+    {
+        "name": "Cursor AI",
+        "tagline": "AI-first code editor",
+        "description": "The AI-first code editor built to make you extraordinarily productive.",
+        "website": "https://cursor.sh",
+        "launch_date": "2024-01-15",
+        "upvotes": 2500,
+        "comments": 180,
+        "topics": "developer tools, ai, coding",
+        "maker": "Cursor Team",
+        "featured": True
+    },
+    {
+        "name": "v0 by Vercel",
+        "tagline": "Generate UI with AI",
+        "description": "A generative user interface system by Vercel powered by AI.",
+        "website": "https://v0.dev",
+        "launch_date": "2023-10-15",
+        "upvotes": 3200,
+        "comments": 250,
+        "topics": "ai, developer tools, design",
+        "maker": "Vercel",
+        "featured": True
+    },
+    {
+        "name": "Supermaven",
+        "tagline": "Fastest AI code completion",
+        "description": "Lightning-fast AI code completion with a 300,000 token context window.",
+        "website": "https://supermaven.com",
+        "launch_date": "2024-02-01",
+        "upvotes": 1800,
+        "comments": 120,
+        "topics": "ai, developer tools, productivity",
+        "maker": "Jacob Jackson",
+        "featured": True
+    },
+    {
+        "name": "Pika 1.0",
+        "tagline": "Idea-to-video platform",
+        "description": "The idea-to-video platform that brings your creativity to motion.",
+        "website": "https://pika.art",
+        "launch_date": "2023-11-28",
+        "upvotes": 4100,
+        "comments": 320,
+        "topics": "ai, video, creativity",
+        "maker": "Pika Labs",
+        "featured": True
+    },
+    {
+        "name": "Perplexity Pages",
+        "tagline": "Turn research into beautiful content",
+        "description": "Convert your Perplexity research into visually stunning, shareable pages.",
+        "website": "https://perplexity.ai",
+        "launch_date": "2024-03-10",
+        "upvotes": 2200,
+        "comments": 145,
+        "topics": "ai, research, content",
+        "maker": "Perplexity AI",
+        "featured": True
+    }
+]
+
+
+@lru_cache(maxsize=1)
+def _sample_ph_df() -> pd.DataFrame:
+    """Build the sample launches frame once; callers must copy before mutating."""
+    df = pd.DataFrame(SAMPLE_PRODUCTS).astype({"upvotes": "int32", "comments": "int32"})
+    df["launch_date"] = pd.to_datetime(df["launch_date"], format="%Y-%m-%d")
+    return df
 
 
 class ProductHuntFetcher:
@@ -22,7 +97,7 @@ class ProductHuntFetcher:
         self.base_url = "https://api.producthunt.com/v2/api/graphql"
         self.api_token = api_token
         self.cache_dir = "data/cache"
-        os.makedirs(self.cache_dir, exist_ok=True)
+        ensure_dir(self.cache_dir)
 
     def fetch_recent_launches(self, days_back: int = 30, limit: int = 50) -> pd.DataFrame:
         """
@@ -97,70 +172,7 @@ class ProductHuntFetcher:
 
     def create_sample_ph_data(self) -> pd.DataFrame:
         """Create sample Product Hunt data for demonstration."""
-        sample_products = [
-            {
-                "name": "Cursor AI",
-                "tagline": "AI-first code editor",
-                "description": "The AI-first code editor built to make you extraordinarily productive.",
-                "website": "https://cursor.sh",
-                "launch_date": "2024-01-15",
-                "upvotes": 2500,
-                "comments": 180,
-                "topics": "developer tools, ai, coding",
-                "maker": "Cursor Team",
-                "featured": True
-            },
-            {
-                "name": "v0 by Vercel",
-                "tagline": "Generate UI with AI",
-                "description": "A generative user interface system by Vercel powered by AI.",
-                "website": "https://v0.dev",
-                "launch_date": "2023-10-15",
-                "upvotes": 3200,
-                "comments": 250,
-                "topics": "ai, developer tools, design",
-                "maker": "Vercel",
-                "featured": True
-            },
-            {
-                "name": "Supermaven",
-                "tagline": "Fastest AI code completion",
-                "description": "Lightning-fast AI code completion with a 300,000 token context window.",
-                "website": "https://supermaven.com",
-                "launch_date": "2024-02-01",
-                "upvotes": 1800,
-                "comments": 120,
-                "topics": "ai, developer tools, productivity",
-                "maker": "Jacob Jackson",
-                "featured": True
-            },
-            {
-                "name": "Pika 1.0",
-                "tagline": "Idea-to-video platform",
-                "description": "The idea-to-video platform that brings your creativity to motion.",
-                "website": "https://pika.art",
-                "launch_date": "2023-11-28",
-                "upvotes": 4100,
-                "comments": 320,
-                "topics": "ai, video, creativity",
-                "maker": "Pika Labs",
-                "featured": True
-            },
-            {
-                "name": "Perplexity Pages",
-                "tagline": "Turn research into beautiful content",
-                "description": "Convert your Perplexity research into visually stunning, shareable pages.",
-                "website": "https://perplexity.ai",
-                "launch_date": "2024-03-10",
-                "upvotes": 2200,
-                "comments": 145,
-                "topics": "ai, research, content",
-                "maker": "Perplexity AI",
-                "featured": True
-            }
-        ]
-
-        df = pd.DataFrame(sample_products)
+        df = _sample_ph_df().copy()
         print(f"Created {len(df)} sample Product Hunt entries")
         return df
 
@@ -178,14 +190,15 @@ class ProductHuntFetcher:
             return df
 
         # Calculate engagement score
-        df["engagement_score"] = df["upvotes"] * 1.0 + df["comments"] * 2.0
+        df["engagement_score"] = (df["upvotes"] * 1.0 + df["comments"] * 2.0).astype("float32")
 
-        # Calculate days since launch
-        df["launch_date"] = pd.to_datetime(df["launch_date"])
+        # Calculate days since launch; sample data and rescored frames are already parsed
+        if not pd.api.types.is_datetime64_any_dtype(df["launch_date"]):
+            df["launch_date"] = pd.to_datetime(df["launch_date"], errors="coerce")
         df["days_since_launch"] = (datetime.now() - df["launch_date"]).dt.days
 
-        # Calculate daily upvote rate
-        df["upvotes_per_day"] = df["upvotes"] / df["days_since_launch"].replace(0, 1)
+        # Calculate daily upvote rate (launches less than a day old count as one day)
+        df["upvotes_per_day"] = (df["upvotes"] / np.maximum(df["days_since_launch"], 1)).astype("float32")
 
         return df
 
@@ -194,41 +207,24 @@ class ProductHuntFetcher:
         cache_path = os.path.join(self.cache_dir, filename)
         df.to_csv(cache_path, index=False)
 
-        # Save metadata
-        metadata = {
-            "last_updated": datetime.now().isoformat(),
-            "record_count": len(df),
-            "source": "Product Hunt"
-        }
-        metadata_path = os.path.join(self.cache_dir, f"{filename}.meta.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
-
         print(f"✓ Cached data to {cache_path}")
 
     def load_from_cache(self, filename: str = "producthunt_products.csv",
                        max_age_hours: int = 24) -> Optional[pd.DataFrame]:
         """Load data from cache if it exists and is recent."""
         cache_path = os.path.join(self.cache_dir, filename)
-        metadata_path = os.path.join(self.cache_dir, f"{filename}.meta.json")
 
-        if not os.path.exists(cache_path):
+        # The cache file's modification time is when it was last saved
+        try:
+            age_hours = (time.time() - os.path.getmtime(cache_path)) / 3600
+        except OSError:
             return None
 
-        # Check metadata
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-
-            last_updated = datetime.fromisoformat(metadata["last_updated"])
-            age_hours = (datetime.now() - last_updated).total_seconds() / 3600
-
-            if age_hours <= max_age_hours:
-                print(f"Loading cached Product Hunt data (age: {age_hours:.1f} hours)")
-                return pd.read_csv(cache_path)
-            else:
-                print(f"Cache expired (age: {age_hours:.1f} hours > {max_age_hours} hours)")
+        if age_hours <= max_age_hours:
+            print(f"Loading cached Product Hunt data (age: {age_hours:.1f} hours)")
+            return pd.read_csv(cache_path)
 
+        print(f"Cache expired (age: {age_hours:.1f} hours > {max_age_hours} hours)")
         return None
 
 
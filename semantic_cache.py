@@ -0,0 +1,94 @@
+"""Semantic cache reusing categories for near-duplicate startup descriptions."""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+
+
+class SemanticCategoryCache:
+    """
+    Looks up categories of previously categorized startups with similar descriptions.
+
+    Descriptions are embedded with a local sentence-transformers model and
+    compared by cosine similarity against every cached description, so
+    paraphrased descriptions can reuse an existing category instead of
+    being sent to Claude.
+    """
+
+    def __init__(self,
+                 path: str = config.SEMANTIC_CACHE_PATH,
+                 model_name: str = config.SEMANTIC_CACHE_MODEL,
+                 threshold: float = config.SEMANTIC_CACHE_THRESHOLD,
+                 version: str = ""):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            path: Path of the .npz file holding cached embeddings and labels
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cached category to be reused
+            version: Label version; a cache file saved under another version is discarded
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.path = path
+        self.threshold = threshold
+        self.version = version
+        self.encoder = SentenceTransformer(model_name)
+
+        dimension = self.encoder.get_sentence_embedding_dimension()
+        self.vectors = np.empty((0, dimension), dtype=np.float32)
+        self.labels: List[Dict] = []
+
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                if "version" in data and str(data["version"]) == self.version:
+                    self.vectors = data["vectors"]
+                    self.labels = json.loads(str(data["labels"]))
+
+    def encode(self, descriptions: List[str]) -> np.ndarray:
+        """Embed descriptions as normalized vectors in a single batch."""
+        return self.encoder.encode(
+            descriptions,
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32)
+
+    def lookup(self, vectors: np.ndarray) -> List[Optional[Dict]]:
+        """Return the cached label of the nearest description, or None below the threshold."""
+        if not self.labels:
+            return [None] * len(vectors)
+
+        # Vectors are normalized, so the inner product is the cosine similarity
+        scores = vectors @ self.vectors.T
+        best = scores.argmax(axis=1)
+
+        return [
+            self.labels[j] if scores[i, j] >= self.threshold else None
+            for i, j in enumerate(best)
+        ]
+
+    def add(self, vectors: np.ndarray, labels: List[Dict]):
+        """Add embeddings and their category labels to the cache."""
+        if not labels:
+            return
+
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.labels.extend(labels)
+
+    def save(self):
+        """Persist the cache to disk."""
+        np.savez(
+            self.path,
+            vectors=self.vectors,
+            labels=np.array(json.dumps(self.labels)),
+            version=np.array(self.version)
+        )
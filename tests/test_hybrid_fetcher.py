@@ -0,0 +1,55 @@
+"""Tests for merging GitHub and Product Hunt data."""
+
+import pandas as pd
+import pytest
+
+from hybrid_fetcher import HybridStartupFetcher
+from producthunt_fetcher import ProductHuntFetcher
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    """Hybrid fetcher whose cache directory lives in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return HybridStartupFetcher()
+
+
+@pytest.fixture
+def launches():
+    """Scored sample Product Hunt launches (launch dates parsed)."""
+    ph_fetcher = ProductHuntFetcher()
+    return ph_fetcher.calculate_engagement_score(ph_fetcher.create_sample_ph_data())
+
+
+def test_merge_without_matching_launches(fetcher, launches):
+    github_df = pd.DataFrame({
+        "name": ["acme-labs", "octo-org"],
+        "stars": [120, 80],
+        "momentum_score": [10.0, 5.0],
+        "created_at": pd.to_datetime(["2024-01-01", "2024-02-01"], utc=True)
+    })
+
+    df = fetcher.merge_datasets(github_df, launches)
+
+    assert len(df) == len(github_df) + len(launches)
+    assert (df["source"] == "GitHub").sum() == len(github_df)
+    github_rows = df[df["source"] == "GitHub"]
+    assert github_rows["ph_upvotes"].isna().all()
+    assert github_rows["launch_date"].isna().all()
+
+
+def test_merge_matching_launch_updates_github_entry(fetcher, launches):
+    github_df = pd.DataFrame({
+        "name": ["cursor-ai"],
+        "homepage": [""],
+        "stars": [500],
+        "momentum_score": [20.0]
+    })
+
+    df = fetcher.merge_datasets(github_df, launches)
+
+    assert len(df) == len(launches)
+    cursor = df[df["name"] == "cursor-ai"].iloc[0]
+    assert cursor["source"] == "GitHub"
+    assert cursor["ph_upvotes"] == 2500
+    assert cursor["website"] == "https://cursor.sh"
@@ -1,5 +1,84 @@
 """Utility functions for the Startup Trends Dashboard."""
 
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Buffer size for cache file reads/writes (the default is 8 KiB)
+IO_BUFFER_SIZE = 1 << 17
+
+# Directories already created by this process
+_ensured_dirs: set = set()
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Show fetcher progress logs as plain console lines.
+
+    Called from entry points only; library modules just create loggers.
+
+    Args:
+        level: Minimum level to show
+    """
+    logging.basicConfig(level=level, format="%(message)s")
+    # The Anthropic client's HTTP library logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def ensure_dir(path: str):
+    """
+    Create a directory if needed, once per process.
+
+    Later calls for the same path skip the filesystem checks entirely.
+    Paths are remembered in absolute form, so a relative path is created
+    again after the working directory changes.
+
+    Args:
+        path: Directory to create
+    """
+    path = os.path.abspath(path)
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def migrate_csv_cache(parquet_path: str) -> bool:
+    """
+    Convert a legacy CSV cache to Parquet the first time it is loaded.
+
+    The CSV is expected next to the Parquet path with a .csv extension. Its
+    "<file>.meta.json" metadata, if any, is renamed to match and the CSV is
+    removed.
+
+    Args:
+        parquet_path: Path of the Parquet cache file
+
+    Returns:
+        True if a CSV cache was migrated
+    """
+    csv_path = os.path.splitext(parquet_path)[0] + ".csv"
+    if os.path.exists(parquet_path) or not os.path.exists(csv_path):
+        return False
+
+    pd.read_csv(csv_path).to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+    if os.path.exists(f"{csv_path}.meta.json"):
+        os.replace(f"{csv_path}.meta.json", f"{parquet_path}.meta.json")
+    os.remove(csv_path)
+
+    logger.info("✓ Migrated cache %s to %s", csv_path, parquet_path)
+    return True
+
+
+# Bound str.format methods, so the format spec is parsed once rather than per call
+_format_billions = "${:.1f}B".format
+_format_millions = "${:.1f}M".format
+
+
 def format_funding(amount: float) -> str:
     """
     Format funding amount intelligently.
@@ -14,12 +93,34 @@ def format_funding(amount: float) -> str:
     """
     if amount >= 1_000_000_000:
         # Format in billions
-        billions = amount / 1_000_000_000
-        return f"${billions:.1f}B"
+        return _format_billions(amount / 1_000_000_000)
     else:
         # Format in millions
-        millions = amount / 1_000_000
-        return f"${millions:.1f}M"
+        return _format_millions(amount / 1_000_000)
+
+
+def format_funding_series(amounts: pd.Series) -> pd.Series:
+    """
+    Format a column of funding amounts, as format_funding does per value.
+
+    Args:
+        amounts: Funding amounts in USD (no missing values)
+
+    Returns:
+        Series of formatted strings, aligned with amounts
+    """
+    values = amounts.to_numpy(dtype=float)
+    billions = values >= 1_000_000_000
+    scaled = np.where(billions, values / 1_000_000_000, values / 1_000_000)
+    # printf-style formatting rounds exactly like the scalar f-string
+    formatted = np.char.add(np.char.mod("$%.1f", scaled), np.where(billions, "B", "M"))
+    return pd.Series(formatted, index=amounts.index)
+
+
+@lru_cache(maxsize=None)
+def _display_formatters(decimals: int):
+    """Build the (billions, millions) formatters for a number of decimals."""
+    return f"${{:.{decimals}f}}B".format, f"${{:.{decimals}f}}M".format
 
 
 def format_funding_for_display(amount: float, decimals: int = 1) -> str:
@@ -33,12 +134,11 @@ def format_funding_for_display(amount: float, decimals: int = 1) -> str:
     Returns:
         Formatted string
     """
+    format_billions, format_millions = _display_formatters(decimals)
     if amount >= 1_000_000_000:
-        value = amount / 1_000_000_000
-        return f"${value:.{decimals}f}B"
+        return format_billions(amount / 1_000_000_000)
     else:
-        value = amount / 1_000_000
-        return f"${value:.{decimals}f}M"
+        return format_millions(amount / 1_000_000)
 
 
 if __name__ == "__main__":